@@ -272,6 +272,7 @@ export const ActivityCard = memo(function ActivityCard({ session }: ActivityCard
               {activity.files.slice(0, 5).map((file, i) => {
                 const url = getFileUrl(file, githubBaseUrl, branch, worktree, repo?.name);
                 const fileName = file.split('/').pop();
+                const relativePath = getRelativeFilePath(file, worktree);
                 const key = `${i}:${file}`;
                 return url ? (
                   <a
@@ -280,8 +281,8 @@ export const ActivityCard = memo(function ActivityCard({ session }: ActivityCard
                     target="_blank"
                     rel="noopener noreferrer"
                     className="file-tag file-tag-link"
-                    title={getRelativeFilePath(file, worktree)}
-                    data-tooltip={getRelativeFilePath(file, worktree)}
+                    title={relativePath}
+                    data-tooltip={relativePath}
                     onClick={(e) => e.stopPropagation()}
                   >
                     {fileName}
@@ -26,22 +26,17 @@ type FileHistoryViewProps = {
   repoName: string;
 };
 
+const TOOL_ICONS = new Map<string, string>([
+  ['Write', '✏️'],
+  ['Edit', '📝'],
+  ['Read', '📖'],
+  ['Bash', '▶️'],
+  ['Grep', '🔍'],
+  ['Glob', '🔍'],
+]);
+
 function getToolIcon(toolName: string): string {
-  switch (toolName) {
-    case 'Write':
-      return '✏️';
-    case 'Edit':
-      return '📝';
-    case 'Read':
-      return '📖';
-    case 'Bash':
-      return '▶️';
-    case 'Grep':
-    case 'Glob':
-      return '🔍';
-    default:
-      return '📄';
-  }
+  return TOOL_ICONS.get(toolName) ?? '📄';
 }
 
 export function FileHistoryView({ filePath, repoName }: FileHistoryViewProps) {
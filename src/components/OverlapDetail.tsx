@@ -1,8 +1,13 @@
-import { useState, useEffect } from 'react';
-import { MultiFileDiff } from '@pierre/diffs/react';
+import { useState, useEffect, lazy, Suspense } from 'react';
 import { fetchWithTimeout } from '@lib/utils/fetch';
 import { formatRelativeTime } from '@lib/utils/time';
 
+// The diff renderer (and its highlighter) is the bulk of this island — load it
+// on first use so the overlap summary renders without waiting for it
+const MultiFileDiff = lazy(() =>
+  import('@pierre/diffs/react').then((m) => ({ default: m.MultiFileDiff }))
+);
+
 type FileOp = {
   id: number;
   session_id: string;
@@ -114,14 +119,22 @@ function EditCard({ edit }: { edit: FileOp }) {
       {/* Diff via @pierre/diffs */}
       {hasDiff ? (
         <div style={{ borderRadius: 'var(--radius-sm)', overflow: 'hidden' }}>
-          <MultiFileDiff
-            oldFile={{ name: fileName, contents: padToLineNumber(edit.old_string ?? '', edit.start_line) }}
-            newFile={{ name: fileName, contents: padToLineNumber(edit.new_string ?? '', edit.start_line) }}
-            options={{
-              diffStyle: 'unified',
-              theme: 'pierre-dark',
-            }}
-          />
+          <Suspense
+            fallback={
+              <p className="text-muted" style={{ fontSize: '0.8125rem', margin: 0 }}>
+                Loading diff...
+              </p>
+            }
+          >
+            <MultiFileDiff
+              oldFile={{ name: fileName, contents: padToLineNumber(edit.old_string ?? '', edit.start_line) }}
+              newFile={{ name: fileName, contents: padToLineNumber(edit.new_string ?? '', edit.start_line) }}
+              options={{
+                diffStyle: 'unified',
+                theme: 'pierre-dark',
+              }}
+            />
+          </Suspense>
         </div>
       ) : (
         <p className="text-muted" style={{ fontSize: '0.8125rem', fontStyle: 'italic', margin: 0 }}>
@@ -295,6 +295,7 @@ const ActivityRow = memo(function ActivityRow({ activity, session, githubBaseUrl
           {activity.files.map((file, i) => {
             const url = getFileUrl(file, githubBaseUrl, session.branch, session.worktree, session.repo?.name);
             const fileName = file.split('/').pop();
+            const relativePath = getRelativeFilePath(file, session.worktree);
             const key = `${i}:${file}`;
             return url ? (
               <a
@@ -303,8 +304,8 @@ const ActivityRow = memo(function ActivityRow({ activity, session, githubBaseUrl
                 target="_blank"
                 rel="noopener noreferrer"
                 className="file-tag file-tag-link"
-                title={getRelativeFilePath(file, session.worktree)}
-                data-tooltip={getRelativeFilePath(file, session.worktree)}
+                title={relativePath}
+                data-tooltip={relativePath}
               >
                 {fileName}
               </a>
@@ -18,6 +18,38 @@ type PackageJson = {
   version: string;
 };
 
+// Upstream releases are infrequent — remember the latest version across page loads
+const LATEST_VERSION_CACHE_KEY = 'overlap-latest-version';
+const LATEST_VERSION_TTL_MS = 60 * 60 * 1000; // 1 hour
+
+function readCachedLatestVersion(): string | null {
+  try {
+    const raw = localStorage.getItem(LATEST_VERSION_CACHE_KEY);
+    if (!raw) return null;
+    const cached = JSON.parse(raw) as { version: string; fetchedAt: number };
+    return Date.now() - cached.fetchedAt < LATEST_VERSION_TTL_MS ? cached.version : null;
+  } catch {
+    return null;
+  }
+}
+
+async function fetchLatestVersion(): Promise<string> {
+  const cached = readCachedLatestVersion();
+  if (cached) return cached;
+
+  const latestRes = await fetch(UPSTREAM_PACKAGE_URL);
+  if (!latestRes.ok) throw new Error('Failed to fetch latest version');
+  const latestData: PackageJson = await latestRes.json();
+
+  try {
+    localStorage.setItem(
+      LATEST_VERSION_CACHE_KEY,
+      JSON.stringify({ version: latestData.version, fetchedAt: Date.now() })
+    );
+  } catch { /* storage unavailable — just skip caching */ }
+  return latestData.version;
+}
+
 function compareVersions(local: string, latest: string): number {
   const localParts = local.split('.').map(Number);
   const latestParts = latest.split('.').map(Number);
@@ -43,18 +75,15 @@ export function UpdateBanner() {
   useEffect(() => {
     async function checkVersions() {
       try {
-        // Fetch local version
-        const localRes = await fetch('/api/v1/version');
+        // Fetch local version and latest upstream version (cached) in parallel
+        const [localRes, latestVersion] = await Promise.all([
+          fetch('/api/v1/version'),
+          fetchLatestVersion(),
+        ]);
         if (!localRes.ok) throw new Error('Failed to fetch local version');
         const localData: LocalVersionResponse = await localRes.json();
         const localVersion = localData.data?.version || localData.version || null;
 
-        // Fetch latest version from upstream
-        const latestRes = await fetch(UPSTREAM_PACKAGE_URL);
-        if (!latestRes.ok) throw new Error('Failed to fetch latest version');
-        const latestData: PackageJson = await latestRes.json();
-        const latestVersion = latestData.version;
-
         setVersionInfo({
           local: localVersion,
           latest: latestVersion,
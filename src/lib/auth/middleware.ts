@@ -1,5 +1,5 @@
 import type { D1Database } from '@cloudflare/workers-types';
-import { getMemberById, getMemberByTokenHash, getTeamConfig, getWebSessionByTokenHash } from '@lib/db/queries';
+import { getMemberByTokenHash, getMemberByWebSessionTokenHash, getTeamConfig } from '@lib/db/queries';
 import type { Member, TeamConfig } from '@lib/db/types';
 
 export type AuthContext = {
@@ -52,28 +52,18 @@ export async function authenticateWebSession(
   // Hash the token to compare with stored hash
   const tokenHash = await hashToken(sessionToken);
 
-  // Find session
-  const webSession = await getWebSessionByTokenHash(db, tokenHash);
-  if (!webSession) {
+  // Resolve session -> member and load team config in parallel
+  const [member, teamConfig] = await Promise.all([
+    getMemberByWebSessionTokenHash(db, tokenHash),
+    getTeamConfig(db),
+  ]);
+  if (!member) {
     return { success: false, error: 'Session expired', status: 401 };
   }
-
-  // Get team config
-  const teamConfig = await getTeamConfig(db);
   if (!teamConfig) {
     return { success: false, error: 'Team not configured', status: 500 };
   }
 
-  // Look up real member from web session
-  if (!webSession.user_id) {
-    return { success: false, error: 'Session has no user', status: 401 };
-  }
-
-  const member = await getMemberById(db, webSession.user_id);
-  if (!member) {
-    return { success: false, error: 'User not found', status: 401 };
-  }
-
   return { success: true, context: { member, teamConfig } };
 }
 
@@ -98,14 +88,14 @@ export async function authenticateTracer(
   // Hash the token to compare with stored hash
   const tokenHash = await hashToken(userToken);
 
-  // Find member by token hash
-  const member = await getMemberByTokenHash(db, tokenHash);
+  // Find member by token hash and load team config in parallel
+  const [member, teamConfig] = await Promise.all([
+    getMemberByTokenHash(db, tokenHash),
+    getTeamConfig(db),
+  ]);
   if (!member) {
     return { success: false, error: 'Invalid user token', status: 401 };
   }
-
-  // Get team config
-  const teamConfig = await getTeamConfig(db);
   if (!teamConfig) {
     return { success: false, error: 'Team not configured', status: 500 };
   }
@@ -4,7 +4,8 @@
  */
 
 import type { D1Database } from '@cloudflare/workers-types';
-import { getMemberById, getTeamConfig, getWebSessionByTokenHash } from '@lib/db/queries';
+import { getMemberByWebSessionTokenHash, getTeamConfig } from '@lib/db/queries';
+import { hashToken } from '@lib/auth/middleware';
 
 export type SessionData = {
   teamName: string;
@@ -31,26 +32,14 @@ export async function getSessionData(
     const sessionToken = sessionCookie.value;
 
     // Hash the token to compare with stored hash
-    const encoder = new TextEncoder();
-    const data = encoder.encode(sessionToken);
-    const hashBuffer = await crypto.subtle.digest('SHA-256', data);
-    const tokenHash = btoa(String.fromCharCode(...new Uint8Array(hashBuffer)));
-
-    // Find session
-    const session = await getWebSessionByTokenHash(db, tokenHash);
-    if (!session?.user_id) {
-      return null;
-    }
-
-    // Get member info
-    const member = await getMemberById(db, session.user_id);
-    if (!member) {
-      return null;
-    }
-
-    // Get team config
-    const config = await getTeamConfig(db);
-    if (!config) {
+    const tokenHash = await hashToken(sessionToken);
+
+    // Resolve session -> member and load team config in one round-trip each, in parallel
+    const [member, config] = await Promise.all([
+      getMemberByWebSessionTokenHash(db, tokenHash),
+      getTeamConfig(db),
+    ]);
+    if (!member || !config) {
       return null;
     }
 
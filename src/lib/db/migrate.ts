@@ -289,7 +289,25 @@ const MIGRATIONS = [
   `UPDATE overlaps SET decision = NULL WHERE public_id IS NULL`,
 ];
 
-export async function ensureMigrated(db: D1Database): Promise<void> {
+// Schema only changes on deploy, which starts fresh isolates, so migrating
+// once per isolate is enough. Shared so concurrent requests await one run.
+// A run with unexpected statement failures is forgotten so the next request
+// retries it; the page itself still renders, as it did before memoization.
+let migrationRun: Promise<void> | null = null;
+
+export function ensureMigrated(db: D1Database): Promise<void> {
+  if (!migrationRun) {
+    migrationRun = runMigrations(db).catch((error) => {
+      migrationRun = null;
+      console.error('Migration incomplete, will retry:', error instanceof Error ? error.message : String(error));
+    });
+  }
+  return migrationRun;
+}
+
+async function runMigrations(db: D1Database): Promise<void> {
+  let failures = 0;
+
   // Always run CREATE TABLE IF NOT EXISTS statements - they're idempotent
   // This ensures new tables are created even for existing deployments
   const statements = SCHEMA
@@ -304,6 +322,7 @@ export async function ensureMigrated(db: D1Database): Promise<void> {
       const msg = error instanceof Error ? error.message : String(error);
       if (!msg.includes('already exists')) {
         console.error('Migration error:', msg, 'Statement:', statement.substring(0, 80));
+        failures++;
       }
     }
   }
@@ -317,6 +336,7 @@ export async function ensureMigrated(db: D1Database): Promise<void> {
       const msg = error instanceof Error ? error.message : String(error);
       if (!msg.includes('duplicate column') && !msg.includes('already exists')) {
         console.error('Migration error:', msg);
+        failures++;
       }
     }
   }
@@ -333,5 +353,10 @@ export async function ensureMigrated(db: D1Database): Promise<void> {
     }
   } catch (error) {
     console.error('public_id backfill error:', error instanceof Error ? error.message : String(error));
+    failures++;
+  }
+
+  if (failures > 0) {
+    throw new Error(`${failures} migration statement(s) failed`);
   }
 }
@@ -9,7 +9,6 @@ import type {
   AgentResponse,
   Overlap,
   ActivityBlock,
-  WebSession,
   SessionWithMember,
   SessionDetail,
   TeamStats,
@@ -22,8 +21,30 @@ import type {
 // TEAM CONFIG QUERIES
 // ============================================================================
 
-export async function getTeamConfig(db: D1Database): Promise<TeamConfig | null> {
-  return db.prepare('SELECT * FROM team_config WHERE id = 1').first<TeamConfig>();
+// team_config is read on every authenticated request but changes rarely —
+// keep it per isolate for a short TTL. Writes through this module invalidate
+// it; other isolates pick up changes once the TTL lapses. Secret checks (join
+// code) and admin settings reads must pass `fresh` so a rotation or save made
+// on another isolate takes effect immediately.
+const TEAM_CONFIG_TTL_MS = 30 * 1000;
+let teamConfigCache: { config: TeamConfig; expiresAt: number } | null = null;
+
+export function invalidateTeamConfigCache(): void {
+  teamConfigCache = null;
+}
+
+export async function getTeamConfig(
+  db: D1Database,
+  options: { fresh?: boolean } = {}
+): Promise<TeamConfig | null> {
+  if (!options.fresh && teamConfigCache && teamConfigCache.expiresAt > Date.now()) {
+    return teamConfigCache.config;
+  }
+
+  const config = await db.prepare('SELECT * FROM team_config WHERE id = 1').first<TeamConfig>();
+  // Don't cache a missing row — setup creates it moments later
+  teamConfigCache = config ? { config, expiresAt: Date.now() + TEAM_CONFIG_TTL_MS } : null;
+  return config;
 }
 
 export async function createTeamConfig(
@@ -37,6 +58,7 @@ export async function createTeamConfig(
     )
     .bind(data.team_name, data.password_hash, data.team_join_code)
     .run();
+  invalidateTeamConfigCache();
 }
 
 export async function updateTeamConfig(
@@ -81,6 +103,7 @@ export async function updateTeamConfig(
     .prepare(`UPDATE team_config SET ${updates.join(', ')} WHERE id = 1`)
     .bind(...values)
     .run();
+  invalidateTeamConfigCache();
 }
 
 // ============================================================================
@@ -916,8 +939,24 @@ export async function detectFileOverlaps(db: D1Database, repoName: string): Prom
 
 /**
  * Get active sessions with file regions for team-state endpoint.
+ * One row per (session, region); region columns are null for sessions with no edits.
  */
-export async function getActiveSessionsWithRegions(db: D1Database): Promise<Record<string, unknown>[]> {
+export type ActiveSessionRegionRow = {
+  session_id: string;
+  user_id: string;
+  display_name: string;
+  repo_name: string;
+  started_at: string;
+  summary: string | null;
+  status: string;
+  file_path: string | null;
+  start_line: number | null;
+  end_line: number | null;
+  function_name: string | null;
+  last_touched_at: string | null;
+};
+
+export async function getActiveSessionsWithRegions(db: D1Database): Promise<ActiveSessionRegionRow[]> {
   const result = await db
     .prepare(
       `SELECT
@@ -943,7 +982,7 @@ export async function getActiveSessionsWithRegions(db: D1Database): Promise<Reco
                 fo.end_line, fo.function_name
        ORDER BY MAX(fo.timestamp) DESC`
     )
-    .all();
+    .all<ActiveSessionRegionRow>();
 
   return result.results;
 }
@@ -1023,45 +1062,41 @@ export async function getLatestEditsForSessions(
 ): Promise<LatestEditRow[]> {
   if (sessionFilePairs.length === 0) return [];
 
-  const results: LatestEditRow[] = [];
-
-  for (const { sessionId, filePath } of sessionFilePairs) {
-    // Get the most recent modify/create op with old_string or new_string
-    const edit = await db
-      .prepare(
-        `SELECT old_string, new_string, timestamp AS edit_timestamp
-         FROM file_operations
-         WHERE session_id = ? AND file_path = ?
-           AND operation IN ('create', 'modify')
-           AND (old_string IS NOT NULL OR new_string IS NOT NULL)
-         ORDER BY timestamp DESC
-         LIMIT 1`
-      )
-      .bind(sessionId, filePath)
-      .first<{ old_string: string | null; new_string: string | null; edit_timestamp: string }>();
+  // One statement per pair (latest edit + push-after check fused), all in one round trip
+  const stmt = db.prepare(
+    `SELECT fo.old_string, fo.new_string, fo.timestamp AS edit_timestamp,
+            EXISTS(
+              SELECT 1 FROM file_operations p
+              WHERE p.session_id = fo.session_id AND p.tool_name = 'Bash'
+                AND p.bash_command LIKE '%git push%'
+                AND p.timestamp > fo.timestamp
+            ) AS has_push
+     FROM file_operations fo
+     WHERE fo.session_id = ? AND fo.file_path = ?
+       AND fo.operation IN ('create', 'modify')
+       AND (fo.old_string IS NOT NULL OR fo.new_string IS NOT NULL)
+     ORDER BY fo.timestamp DESC
+     LIMIT 1`
+  );
+  const batchResults = await db.batch<{
+    old_string: string | null;
+    new_string: string | null;
+    edit_timestamp: string;
+    has_push: number;
+  }>(sessionFilePairs.map(({ sessionId, filePath }) => stmt.bind(sessionId, filePath)));
 
+  const results: LatestEditRow[] = [];
+  for (let i = 0; i < sessionFilePairs.length; i++) {
+    const edit = batchResults[i].results[0];
     if (!edit) continue;
 
-    // Check for git push after this edit
-    const pushCheck = await db
-      .prepare(
-        `SELECT EXISTS(
-           SELECT 1 FROM file_operations
-           WHERE session_id = ? AND tool_name = 'Bash'
-             AND bash_command LIKE '%git push%'
-             AND timestamp > ?
-         ) AS has_push`
-      )
-      .bind(sessionId, edit.edit_timestamp)
-      .first<{ has_push: number }>();
-
     results.push({
-      session_id: sessionId,
-      file_path: filePath,
+      session_id: sessionFilePairs[i].sessionId,
+      file_path: sessionFilePairs[i].filePath,
       old_string: edit.old_string,
       new_string: edit.new_string,
       edit_timestamp: edit.edit_timestamp,
-      has_push_after_edit: pushCheck?.has_push ?? 0,
+      has_push_after_edit: edit.has_push ?? 0,
     });
   }
 
@@ -1325,6 +1360,30 @@ export async function markStaleSessions(db: D1Database): Promise<number> {
   return result.meta.changes ?? 0;
 }
 
+// Dashboard loads, the activity API and every SSE connection all trigger the
+// sweep — share one timestamp per isolate so they don't repeat the same write.
+const STALE_SWEEP_INTERVAL_MS = 30 * 1000;
+let lastStaleSweep = 0;
+// The latest sweep, shared like migrationRun so a throttled caller that needs
+// fresh statuses waits for a sweep another request started but hasn't finished
+let staleSweepRun: Promise<void> = Promise.resolve();
+
+/**
+ * Run markStaleSessions at most once per STALE_SWEEP_INTERVAL_MS per isolate.
+ * Callers inside the window await the most recent sweep instead of skipping it.
+ * The cron endpoint calls markStaleSessions directly and is never throttled.
+ */
+export function maybeMarkStaleSessions(db: D1Database): Promise<void> {
+  if (Date.now() - lastStaleSweep < STALE_SWEEP_INTERVAL_MS) return staleSweepRun;
+  lastStaleSweep = Date.now();
+  staleSweepRun = markStaleSessions(db).catch((error) => {
+    // Let the next caller retry rather than waiting out the interval
+    lastStaleSweep = 0;
+    console.error('Stale session sweep failed:', error instanceof Error ? error.message : String(error));
+  });
+  return staleSweepRun;
+}
+
 // ============================================================================
 // WEB SESSION QUERIES
 // ============================================================================
@@ -1336,17 +1395,46 @@ export async function createWebSession(db: D1Database, id: string, tokenHash: st
     .run();
 }
 
-export async function getWebSessionByTokenHash(db: D1Database, tokenHash: string): Promise<WebSession | null> {
+/**
+ * Resolve a live web session straight to its member in one round-trip.
+ * Returns null if the session is missing, expired, or has no member.
+ */
+export async function getMemberByWebSessionTokenHash(db: D1Database, tokenHash: string): Promise<Member | null> {
   return db
-    .prepare("SELECT * FROM web_sessions WHERE token_hash = ? AND datetime(expires_at) > datetime('now')")
+    .prepare(
+      `SELECT m.* FROM web_sessions ws
+       JOIN members m ON m.user_id = ws.user_id
+       WHERE ws.token_hash = ? AND datetime(ws.expires_at) > datetime('now')`
+    )
     .bind(tokenHash)
-    .first<WebSession>();
+    .first<Member>();
 }
 
 export async function deleteExpiredWebSessions(db: D1Database): Promise<void> {
   await db.prepare("DELETE FROM web_sessions WHERE datetime(expires_at) < datetime('now')").run();
 }
 
+// Expired rows are already ignored by session lookups, so deleting them is pure
+// housekeeping — once an hour per isolate is plenty.
+const WEB_SESSION_GC_INTERVAL_MS = 60 * 60 * 1000;
+let lastWebSessionGc = 0;
+
+/**
+ * Run deleteExpiredWebSessions at most once per WEB_SESSION_GC_INTERVAL_MS per isolate.
+ * The cron endpoint calls deleteExpiredWebSessions directly and is never throttled.
+ */
+export async function maybeDeleteExpiredWebSessions(db: D1Database): Promise<void> {
+  if (Date.now() - lastWebSessionGc < WEB_SESSION_GC_INTERVAL_MS) return;
+  lastWebSessionGc = Date.now();
+  try {
+    await deleteExpiredWebSessions(db);
+  } catch (error) {
+    // Let the next caller retry rather than waiting out the interval
+    lastWebSessionGc = 0;
+    console.error('Expired web session cleanup failed:', error instanceof Error ? error.message : String(error));
+  }
+}
+
 // ============================================================================
 // ACTIVITY BLOCK QUERIES
 // ============================================================================
@@ -11,6 +11,7 @@ const HEARTBEAT_URL = 'https://overlap.dev/api/v1/heartbeat';
 const HEARTBEAT_INTERVAL_MS = 24 * 60 * 60 * 1000; // 24 hours
 
 let lastHeartbeat = 0;
+let cachedInstanceHash: { url: string; hash: string } | null = null;
 
 async function hashString(input: string): Promise<string> {
   const encoder = new TextEncoder();
@@ -27,33 +28,32 @@ export async function maybeHeartbeat(db: D1Database, instanceUrl: string): Promi
   const config = await getTeamConfig(db);
   if (!config) return;
 
-  const memberCount = await db.prepare('SELECT COUNT(*) as c FROM members').first<{ c: number }>();
-  const repoCount = await db.prepare('SELECT COUNT(*) as c FROM repos').first<{ c: number }>();
-
-  // All-time overlap detection stats
-  const overlapStats = await db.prepare(`
-    SELECT
-      COUNT(*) as total,
-      SUM(CASE WHEN decision = 'warn' THEN 1 ELSE 0 END) as warns,
-      SUM(CASE WHEN decision = 'block' THEN 1 ELSE 0 END) as blocks
-    FROM overlaps
-  `).first<{ total: number; warns: number; blocks: number }>();
-
-  // Estimated savings from overlaps (all-time)
-  const savingsRows = await db.prepare(`
-    SELECT
-      o.decision,
-      sa.total_cost_usd as cost_a, sa.total_input_tokens as input_a, sa.total_output_tokens as output_a,
-      sa.cache_creation_tokens as cache_create_a, sa.cache_read_tokens as cache_read_a, sa.model as model_a,
-      sb.total_cost_usd as cost_b, sb.total_input_tokens as input_b, sb.total_output_tokens as output_b,
-      sb.cache_creation_tokens as cache_create_b, sb.cache_read_tokens as cache_read_b, sb.model as model_b
-    FROM overlaps o
-    LEFT JOIN sessions sa ON o.session_id_a = sa.id
-    LEFT JOIN sessions sb ON o.session_id_b = sb.id
-  `).all();
+  // Independent stat queries — run them concurrently rather than back to back
+  const [counts, savingsRows] = await Promise.all([
+    db.prepare(
+      'SELECT (SELECT COUNT(*) FROM members) as members, (SELECT COUNT(*) FROM repos) as repos'
+    ).first<{ members: number; repos: number }>(),
+    // Estimated savings from overlaps (all-time) — one row per overlap, so it also yields the detection stats
+    db.prepare(`
+      SELECT
+        o.decision,
+        sa.total_cost_usd as cost_a, sa.total_input_tokens as input_a, sa.total_output_tokens as output_a,
+        sa.cache_creation_tokens as cache_create_a, sa.cache_read_tokens as cache_read_a, sa.model as model_a,
+        sb.total_cost_usd as cost_b, sb.total_input_tokens as input_b, sb.total_output_tokens as output_b,
+        sb.cache_creation_tokens as cache_create_b, sb.cache_read_tokens as cache_read_b, sb.model as model_b
+      FROM overlaps o
+      LEFT JOIN sessions sa ON o.session_id_a = sa.id
+      LEFT JOIN sessions sb ON o.session_id_b = sb.id
+    `).all(),
+  ]);
 
   let estimatedSavings = 0;
+  let totalWarns = 0;
+  let totalBlocks = 0;
   for (const row of savingsRows.results as Record<string, unknown>[]) {
+    if (row.decision === 'block') totalBlocks++;
+    else if (row.decision === 'warn') totalWarns++;
+
     const rawCostA = row.cost_a as number | null;
     const costA = (rawCostA != null && rawCostA > 0) ? rawCostA : estimateCostFromTokens(
       row.model_a as string | null, row.input_a as number | null, row.output_a as number | null,
@@ -69,8 +69,13 @@ export async function maybeHeartbeat(db: D1Database, instanceUrl: string): Promi
     else if (row.decision === 'warn') estimatedSavings += maxCost * 0.5;
   }
 
-  // Stable anonymous instance ID — must match tracer's hash (which hashes instance_url)
-  const instanceHash = await hashString(instanceUrl);
+  // Stable anonymous instance ID — must match tracer's hash (which hashes instance_url).
+  // The origin doesn't change for the life of the isolate, so hash it once.
+  let instanceHash = cachedInstanceHash?.url === instanceUrl ? cachedInstanceHash.hash : null;
+  if (!instanceHash) {
+    instanceHash = await hashString(instanceUrl);
+    cachedInstanceHash = { url: instanceUrl, hash: instanceHash };
+  }
 
   await fetch(HEARTBEAT_URL, {
     method: 'POST',
@@ -78,11 +83,11 @@ export async function maybeHeartbeat(db: D1Database, instanceUrl: string): Promi
     body: JSON.stringify({
       instance_hash: instanceHash,
       version: VERSION,
-      user_count: memberCount?.c ?? 0,
-      repo_count: repoCount?.c ?? 0,
-      total_overlaps: overlapStats?.total ?? 0,
-      total_warns: overlapStats?.warns ?? 0,
-      total_blocks: overlapStats?.blocks ?? 0,
+      user_count: counts?.members ?? 0,
+      repo_count: counts?.repos ?? 0,
+      total_overlaps: savingsRows.results.length,
+      total_warns: totalWarns,
+      total_blocks: totalBlocks,
       estimated_savings_usd: Math.round(estimatedSavings * 100) / 100,
     }),
     signal: AbortSignal.timeout(3000),
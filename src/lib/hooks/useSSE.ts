@@ -68,7 +68,11 @@ export function useSSE({ url, onEvent, eventName = 'activity', enabled = true }:
         return;
       }
 
-      const delay = retryDelayRef.current;
+      // Equal jitter: wait at least half the current backoff ceiling (so the retry
+      // budget still spans a real outage) plus a random share of the other half,
+      // so tabs that lost the stream together don't all reconnect in lockstep
+      const ceiling = retryDelayRef.current;
+      const delay = ceiling / 2 + Math.random() * (ceiling / 2);
       setError(`Reconnecting in ${Math.round(delay / 1000)}s...`);
       retryTimeoutRef.current = setTimeout(() => {
         retryDelayRef.current = Math.min(
@@ -102,6 +102,29 @@ export function getAvailablePeriods(type: InsightPeriodType, earliestDate: strin
 
 // ── LLM Provider ────────────────────────────────────────────────────────
 
+const ERROR_SNIPPET_CHARS = 300;
+
+/**
+ * Read just enough of an error response body for the error message.
+ * Provider error pages can be large HTML documents; stop reading once we
+ * have the snippet and cancel the rest of the stream.
+ */
+async function readErrorSnippet(resp: Response): Promise<string> {
+  if (!resp.body) return '';
+  const reader = resp.body.getReader();
+  const decoder = new TextDecoder();
+  let text = '';
+  try {
+    while (text.length < ERROR_SNIPPET_CHARS) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      text += decoder.decode(value, { stream: true });
+    }
+    await reader.cancel();
+  } catch { /* best-effort — the status code is what matters */ }
+  return text.slice(0, ERROR_SNIPPET_CHARS);
+}
+
 type LLMProvider = {
   call(prompt: string, apiKey: string, model: string, maxTokens?: number): Promise<string>;
 };
@@ -115,8 +138,8 @@ const providers: Record<string, LLMProvider> = {
         body: JSON.stringify({ model: model || 'claude-haiku-4-5', max_tokens: maxTokens, stream: true, messages: [{ role: 'user', content: prompt }] }),
       });
       if (!resp.ok) {
-        const body = await resp.text().catch(() => '');
-        throw new Error(`Anthropic API error ${resp.status}: ${body.slice(0, 300)}`);
+        const body = await readErrorSnippet(resp);
+        throw new Error(`Anthropic API error ${resp.status}: ${body}`);
       }
       // Read SSE stream and collect text deltas
       const reader = resp.body!.getReader();
@@ -150,8 +173,8 @@ const providers: Record<string, LLMProvider> = {
         body: JSON.stringify({ model: model || 'gpt-4o-mini', max_tokens: maxTokens, messages: [{ role: 'user', content: prompt }] }),
       });
       if (!resp.ok) {
-        const body = await resp.text().catch(() => '');
-        throw new Error(`OpenAI API error ${resp.status}: ${body.slice(0, 300)}`);
+        const body = await readErrorSnippet(resp);
+        throw new Error(`OpenAI API error ${resp.status}: ${body}`);
       }
       const data = (await resp.json()) as { choices: Array<{ message: { content: string } }> };
       return data.choices[0]?.message?.content?.trim() || '{}';
@@ -165,8 +188,8 @@ const providers: Record<string, LLMProvider> = {
         body: JSON.stringify({ model: model || 'grok-4-fast-non-reasoning', max_tokens: maxTokens, messages: [{ role: 'user', content: prompt }] }),
       });
       if (!resp.ok) {
-        const body = await resp.text().catch(() => '');
-        throw new Error(`xAI API error ${resp.status}: ${body.slice(0, 300)}`);
+        const body = await readErrorSnippet(resp);
+        throw new Error(`xAI API error ${resp.status}: ${body}`);
       }
       const data = (await resp.json()) as { choices: Array<{ message: { content: string } }> };
       return data.choices[0]?.message?.content?.trim() || '{}';
@@ -181,8 +204,8 @@ const providers: Record<string, LLMProvider> = {
         body: JSON.stringify({ contents: [{ parts: [{ text: prompt }] }], generationConfig: { maxOutputTokens: maxTokens } }),
       });
       if (!resp.ok) {
-        const body = await resp.text().catch(() => '');
-        throw new Error(`Google API error ${resp.status}: ${body.slice(0, 300)}`);
+        const body = await readErrorSnippet(resp);
+        throw new Error(`Google API error ${resp.status}: ${body}`);
       }
       const data = (await resp.json()) as { candidates: Array<{ content: { parts: Array<{ text: string }> } }> };
       return data.candidates[0]?.content?.parts[0]?.text?.trim() || '{}';
@@ -772,8 +795,9 @@ export async function generateInsightNarrative(
     .replace('{period_label}', periodLabel)
     .replace('{period_start}', periodStart)
     .replace('{period_end}', periodEnd)
-    .replace('{stats_json}', JSON.stringify({ ...aggregated, facet_stats: facetStats }, null, 2))
-    .replace('{facets_json}', JSON.stringify(facetSummaries, null, 2));
+    // Compact JSON: indentation only adds prompt tokens for the model to read
+    .replace('{stats_json}', JSON.stringify({ ...aggregated, facet_stats: facetStats }))
+    .replace('{facets_json}', JSON.stringify(facetSummaries));
 
   const raw = await provider.call(prompt, apiKey, model, 32000);
   const result = parseJSON<SynthesisResult>(raw);
@@ -25,25 +25,20 @@ const SCOPE_PATTERNS: [RegExp, string, string][] = [
 /**
  * Map tool name to a verb for heuristic summaries.
  */
+const TOOL_VERBS = new Map<string, string>([
+  ['Edit', 'Editing'],
+  ['Write', 'Editing'],
+  ['MultiEdit', 'Editing'],
+  ['NotebookEdit', 'Editing'],
+  ['Read', 'Reading'],
+  ['Grep', 'Searching'],
+  ['Glob', 'Finding files in'],
+  ['Bash', 'Running command in'],
+]);
+
 function getVerb(toolName?: string): string {
   if (!toolName) return 'Editing';
-  switch (toolName) {
-    case 'Edit':
-    case 'Write':
-    case 'MultiEdit':
-    case 'NotebookEdit':
-      return 'Editing';
-    case 'Read':
-      return 'Reading';
-    case 'Grep':
-      return 'Searching';
-    case 'Glob':
-      return 'Finding files in';
-    case 'Bash':
-      return 'Running command in';
-    default:
-      return 'Working on';
-  }
+  return TOOL_VERBS.get(toolName) ?? 'Working on';
 }
 
 function classifyByPath(files: string[], toolName?: string): ClassificationResult {
@@ -17,6 +17,10 @@ const providers: Record<LLMProviderName, LLMProvider> = {
   google: googleProvider,
 };
 
+// Redact common API key patterns: sk-xxx, xai-xxx, key-xxx, AIza..., Bearer tokens —
+// one alternation so error messages are scanned once
+const SECRET_PATTERN = /\b(?:(?:sk-|xai-|key-|AIza)[A-Za-z0-9_\-]{10,}|Bearer\s+[A-Za-z0-9_\-.]{10,})\b/g;
+
 export function getProvider(name: LLMProviderName): LLMProvider {
   const provider = providers[name];
   if (!provider) {
@@ -59,9 +63,9 @@ export async function classifyActivity(
   } catch (error) {
     const sanitizedError = error instanceof Error
       ? error.message
-          // Redact common API key patterns: sk-xxx, xai-xxx, key-xxx, Bearer tokens
-          .replace(/\b(sk-|xai-|key-|AIza)[A-Za-z0-9_\-]{10,}\b/g, '[REDACTED_KEY]')
-          .replace(/\bBearer\s+[A-Za-z0-9_\-.]{10,}\b/g, 'Bearer [REDACTED_KEY]')
+          .replace(SECRET_PATTERN, (match) =>
+            match.startsWith('Bearer') ? 'Bearer [REDACTED_KEY]' : '[REDACTED_KEY]'
+          )
       : 'Classification failed';
     console.error('LLM classification failed, falling back to heuristic:', sanitizedError);
     return heuristicProvider.classify(files, '', undefined, toolName);
@@ -0,0 +1,53 @@
+import type { ClassificationResult, LLMProvider } from './types';
+import { buildPrompt, parseClassificationResponse } from './types';
+
+/**
+ * Build a classifier for an OpenAI-compatible chat completions API.
+ * OpenAI and xAI share the request/response shape and differ only in endpoint and defaults.
+ */
+export function createOpenAICompatibleProvider(
+  name: string,
+  apiUrl: string,
+  label: string,
+  defaultModel: string
+): LLMProvider {
+  return {
+    name,
+
+    async classify(files: string[], apiKey: string, model?: string, toolName?: string): Promise<ClassificationResult> {
+      const response = await fetch(apiUrl, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          Authorization: `Bearer ${apiKey}`,
+        },
+        body: JSON.stringify({
+          model: model || defaultModel,
+          max_tokens: 256,
+          messages: [
+            {
+              role: 'user',
+              content: buildPrompt(files, toolName),
+            },
+          ],
+        }),
+      });
+
+      if (!response.ok) {
+        console.error(`${label} API error: status`, response.status);
+        throw new Error(`${label} API error: ${response.status}`);
+      }
+
+      const data = await response.json() as {
+        choices: Array<{ message: { content: string } }>;
+      };
+
+      const content = data.choices[0]?.message?.content;
+      if (!content) {
+        throw new Error('No content in response');
+      }
+
+      return parseClassificationResponse(content);
+    },
+  };
+}
@@ -29,29 +29,25 @@ Respond ONLY with valid JSON, no markdown or explanation.`;
 /**
  * Map a tool name to a human-readable operation label for the LLM prompt.
  */
+const OPERATION_LABELS = new Map<string, string>([
+  ['Edit', 'Editing files'],
+  ['Write', 'Editing files'],
+  ['MultiEdit', 'Editing files'],
+  ['NotebookEdit', 'Editing files'],
+  ['Read', 'Reading files'],
+  ['Grep', 'Searching code'],
+  ['Glob', 'Finding files'],
+  ['Bash', 'Running a command'],
+]);
+
 function getOperationLabel(toolName?: string): string {
   if (!toolName) return 'Editing files';
-  switch (toolName) {
-    case 'Edit':
-    case 'Write':
-    case 'MultiEdit':
-    case 'NotebookEdit':
-      return 'Editing files';
-    case 'Read':
-      return 'Reading files';
-    case 'Grep':
-      return 'Searching code';
-    case 'Glob':
-      return 'Finding files';
-    case 'Bash':
-      return 'Running a command';
-    default:
-      return `Using ${toolName}`;
-  }
+  return OPERATION_LABELS.get(toolName) ?? `Using ${toolName}`;
 }
 
 export function buildPrompt(files: string[], toolName?: string): string {
-  const sanitized = files
+  // Dedupe (order-preserving) before capping so repeats don't crowd out distinct files
+  const sanitized = [...new Set(files)]
     .slice(0, 50)
     .map(f => f.replace(/[\x00-\x1f\x7f]/g, '').substring(0, 500));
   return CLASSIFICATION_PROMPT
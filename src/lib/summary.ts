@@ -6,12 +6,17 @@
  */
 
 import type { D1Database } from '@cloudflare/workers-types';
-import { getTeamConfig, getSessionPrompts, getSessionAgentResponses, updateSessionSummary, getSessionById } from '@lib/db/queries';
+import { getTeamConfig, getSessionPrompts, getSessionAgentResponses, updateSessionSummary } from '@lib/db/queries';
 // Types used internally - TeamConfig from queries, FileOperation not needed as we query directly
 import { decrypt } from '@lib/utils/crypto';
 
 const SUMMARY_THRESHOLD = 3; // Generate summary after this many events
 
+// Rolling summaries currently being generated in this isolate. Back-to-back
+// ingest batches for one session all cross the threshold before the first
+// summary resets the counter — only the first should call the LLM.
+const rollingSummariesInFlight = new Set<string>();
+
 // Prompt for summary generation
 const SUMMARY_PROMPT = `Write a brief 1-2 sentence summary of this coding session's objective.
 Write in active voice, present tense, from a third-person perspective (e.g., "Building...", "Refactoring...", "Adding...").
@@ -68,69 +73,51 @@ const anthropicSummaryProvider: SummaryProvider = {
   },
 };
 
-// OpenAI provider for summaries
-const openaiSummaryProvider: SummaryProvider = {
-  name: 'openai',
-
-  async generateSummary(prompts: string[], files: string[], responses: string[], apiKey: string, model?: string): Promise<string> {
-    const prompt = buildSummaryPrompt(prompts, files, responses);
+// OpenAI-compatible chat completions providers for summaries (OpenAI, xAI)
+function createOpenAICompatibleSummaryProvider(
+  name: string,
+  apiUrl: string,
+  label: string,
+  defaultModel: string
+): SummaryProvider {
+  return {
+    name,
 
-    const response = await fetch('https://api.openai.com/v1/chat/completions', {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        Authorization: `Bearer ${apiKey}`,
-      },
-      body: JSON.stringify({
-        model: model || 'gpt-5-nano',
-        max_tokens: 200,
-        messages: [{ role: 'user', content: prompt }],
-      }),
-    });
+    async generateSummary(prompts: string[], files: string[], responses: string[], apiKey: string, model?: string): Promise<string> {
+      const prompt = buildSummaryPrompt(prompts, files, responses);
 
-    if (!response.ok) {
-      throw new Error(`OpenAI API error: ${response.status}`);
-    }
-
-    const data = (await response.json()) as {
-      choices: Array<{ message: { content: string } }>;
-    };
-
-    return data.choices[0]?.message?.content?.trim() || 'Working on code';
-  },
-};
-
-// xAI provider for summaries
-const xaiSummaryProvider: SummaryProvider = {
-  name: 'xai',
-
-  async generateSummary(prompts: string[], files: string[], responses: string[], apiKey: string, model?: string): Promise<string> {
-    const prompt = buildSummaryPrompt(prompts, files, responses);
+      const response = await fetch(apiUrl, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          Authorization: `Bearer ${apiKey}`,
+        },
+        body: JSON.stringify({
+          model: model || defaultModel,
+          max_tokens: 200,
+          messages: [{ role: 'user', content: prompt }],
+        }),
+      });
 
-    const response = await fetch('https://api.x.ai/v1/chat/completions', {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        Authorization: `Bearer ${apiKey}`,
-      },
-      body: JSON.stringify({
-        model: model || 'grok-4-fast-non-reasoning',
-        max_tokens: 200,
-        messages: [{ role: 'user', content: prompt }],
-      }),
-    });
+      if (!response.ok) {
+        throw new Error(`${label} API error: ${response.status}`);
+      }
 
-    if (!response.ok) {
-      throw new Error(`xAI API error: ${response.status}`);
-    }
+      const data = (await response.json()) as {
+        choices: Array<{ message: { content: string } }>;
+      };
 
-    const data = (await response.json()) as {
-      choices: Array<{ message: { content: string } }>;
-    };
+      return data.choices[0]?.message?.content?.trim() || 'Working on code';
+    },
+  };
+}
 
-    return data.choices[0]?.message?.content?.trim() || 'Working on code';
-  },
-};
+const openaiSummaryProvider = createOpenAICompatibleSummaryProvider(
+  'openai', 'https://api.openai.com/v1/chat/completions', 'OpenAI', 'gpt-5-nano'
+);
+const xaiSummaryProvider = createOpenAICompatibleSummaryProvider(
+  'xai', 'https://api.x.ai/v1/chat/completions', 'xAI', 'grok-4-fast-non-reasoning'
+);
 
 // Google provider for summaries
 const googleSummaryProvider: SummaryProvider = {
@@ -193,16 +180,6 @@ function buildSummaryPrompt(prompts: string[], files: string[], responses: strin
     .replace('{files}', fileList || 'No files touched');
 }
 
-/**
- * Check if a session should have its summary regenerated.
- * Returns true if summary_event_count >= SUMMARY_THRESHOLD.
- */
-export async function shouldGenerateSummary(db: D1Database, sessionId: string): Promise<boolean> {
-  const session = await getSessionById(db, sessionId);
-  if (!session) return false;
-  return session.summary_event_count >= SUMMARY_THRESHOLD;
-}
-
 /**
  * Generate and store a rolling summary for a session.
  * Uses the team's configured LLM provider.
@@ -222,19 +199,27 @@ export async function generateSessionSummary(
       return;
     }
 
-    // Get session prompts, file operations, and agent responses
-    const prompts = await getSessionPrompts(db, sessionId);
-    const agentResponses = await getSessionAgentResponses(db, sessionId);
-
-    const fileOpsResult = await db
-      .prepare(
-        `SELECT file_path, tool_name, MAX(timestamp) as last_ts FROM file_operations
-         WHERE session_id = ? GROUP BY file_path, tool_name ORDER BY last_ts`
-      )
-      .bind(sessionId)
-      .all<{ file_path: string; tool_name: string }>();
-
-    const files = fileOpsResult.results.map((fo) => `${fo.file_path} (${fo.tool_name})`);
+    // Get session prompts, file operations, and agent responses in parallel
+    const [prompts, agentResponses, fileOpsResult] = await Promise.all([
+      getSessionPrompts(db, sessionId),
+      getSessionAgentResponses(db, sessionId),
+      db
+        .prepare(
+          `SELECT file_path, tool_name, MAX(timestamp) as last_ts FROM file_operations
+           WHERE session_id = ? GROUP BY file_path, tool_name ORDER BY last_ts`
+        )
+        .bind(sessionId)
+        .all<{ file_path: string; tool_name: string }>(),
+    ]);
+
+    // One line per file listing every tool used on it, so repeat paths don't crowd the prompt's file slots
+    const toolsByFile = new Map<string, string[]>();
+    for (const fo of fileOpsResult.results) {
+      const tools = toolsByFile.get(fo.file_path);
+      if (tools) tools.push(fo.tool_name);
+      else toolsByFile.set(fo.file_path, [fo.tool_name]);
+    }
+    const files = [...toolsByFile].map(([filePath, tools]) => `${filePath} (${tools.join(', ')})`);
     const promptTexts = prompts.map((p) => p.prompt_text).filter((t): t is string => t != null);
     const responseTexts = agentResponses
       .filter((ar) => ar.response_type === 'text' && ar.response_text)
@@ -285,18 +270,37 @@ export async function generateSessionSummary(
 }
 
 /**
- * Check and generate summary if needed.
- * Called after processing events in ingest.
- * Uses ctx.waitUntil() to not block the response.
+ * Check and generate summaries for the sessions touched by an ingest batch.
+ * One query finds every session at the threshold instead of one read per session;
+ * sessions whose rolling summary is already in flight here are skipped.
+ * Called from ingest via ctx.waitUntil() so it doesn't block the response.
  */
-export async function maybeGenerateSummary(
+export async function maybeGenerateSummaries(
   db: D1Database,
-  sessionId: string,
+  sessionIds: string[],
   encryptionKey?: string,
   cachedTeamConfig?: import('@lib/db/types').TeamConfig | null,
 ): Promise<void> {
-  const shouldGenerate = await shouldGenerateSummary(db, sessionId);
-  if (shouldGenerate) {
-    await generateSessionSummary(db, sessionId, encryptionKey, cachedTeamConfig);
-  }
+  if (sessionIds.length === 0) return;
+
+  const due = await db
+    .prepare(
+      `SELECT id FROM sessions
+       WHERE id IN (${sessionIds.map(() => '?').join(',')}) AND summary_event_count >= ?`
+    )
+    .bind(...sessionIds, SUMMARY_THRESHOLD)
+    .all<{ id: string }>();
+
+  await Promise.all(
+    due.results
+      .filter((row) => !rollingSummariesInFlight.has(row.id))
+      .map(async (row) => {
+        rollingSummariesInFlight.add(row.id);
+        try {
+          await generateSessionSummary(db, row.id, encryptionKey, cachedTeamConfig);
+        } finally {
+          rollingSummariesInFlight.delete(row.id);
+        }
+      })
+  );
 }
@@ -3,18 +3,22 @@
  * Used by ActivityCard and SessionDetail components.
  */
 
+const GITHUB_SSH_RE = /^git@github\.com:(.+?)(?:\.git)?$/;
+const GITHUB_HTTPS_RE = /^https:\/\/github\.com\/(.+?)(?:\.git)?$/;
+const OWNER_REPO_RE = /^[a-zA-Z0-9._-]+\/[a-zA-Z0-9._-]+$/;
+
 /** Parse git remote URL to GitHub web URL */
 export function parseGitHubUrl(remoteUrl: string | null): string | null {
   if (!remoteUrl) return null;
 
   // Handle SSH format: git@github.com:owner/repo.git
-  const sshMatch = remoteUrl.match(/^git@github\.com:(.+?)(?:\.git)?$/);
+  const sshMatch = GITHUB_SSH_RE.exec(remoteUrl);
   if (sshMatch) {
     return `https://github.com/${sshMatch[1]}`;
   }
 
   // Handle HTTPS format: https://github.com/owner/repo.git
-  const httpsMatch = remoteUrl.match(/^https:\/\/github\.com\/(.+?)(?:\.git)?$/);
+  const httpsMatch = GITHUB_HTTPS_RE.exec(remoteUrl);
   if (httpsMatch) {
     return `https://github.com/${httpsMatch[1]}`;
   }
@@ -31,11 +35,14 @@ export function parseGitHubUrl(remoteUrl: string | null): string | null {
 export function getRelativeFilePath(absolutePath: string, worktree: string | null): string {
   if (!worktree) return absolutePath;
 
-  // Normalize paths (remove trailing slashes)
-  const normalizedWorktree = worktree.replace(/\/+$/, '');
+  if (worktree.endsWith('/')) {
+    const prefix = worktree.replace(/\/+$/, '') + '/';
+    return absolutePath.startsWith(prefix) ? absolutePath.slice(prefix.length) : absolutePath;
+  }
 
-  if (absolutePath.startsWith(normalizedWorktree + '/')) {
-    return absolutePath.slice(normalizedWorktree.length + 1);
+  // Common case — compare against the worktree in place instead of building "<worktree>/"
+  if (absolutePath[worktree.length] === '/' && absolutePath.startsWith(worktree)) {
+    return absolutePath.slice(worktree.length + 1);
   }
 
   return absolutePath;
@@ -51,20 +58,21 @@ export function getStatusLabel(status: string): string {
   }
 }
 
+const AGENT_LABELS = new Map<string, string>([
+  ['claude_code', 'Claude'],
+  ['codex', 'Codex'],
+  ['cursor', 'Cursor'],
+  ['windsurf', 'Windsurf'],
+  ['copilot', 'Copilot'],
+  ['aider', 'Aider'],
+  ['cline', 'Cline'],
+  ['devin', 'Devin'],
+]);
+
 /** Get display name for a coding agent type */
 export function getAgentLabel(agentType: string | null | undefined): string {
   if (!agentType) return 'Agent';
-  switch (agentType) {
-    case 'claude_code': return 'Claude';
-    case 'codex': return 'Codex';
-    case 'cursor': return 'Cursor';
-    case 'windsurf': return 'Windsurf';
-    case 'copilot': return 'Copilot';
-    case 'aider': return 'Aider';
-    case 'cline': return 'Cline';
-    case 'devin': return 'Devin';
-    default: return agentType.replace(/_/g, ' ').replace(/\b\w/g, (c) => c.toUpperCase());
-  }
+  return AGENT_LABELS.get(agentType) ?? agentType.replace(/_/g, ' ').replace(/\b\w/g, (c) => c.toUpperCase());
 }
 
 /** Encode a branch name for use in GitHub URLs, preserving `/` separators */
@@ -82,7 +90,7 @@ export function getBranchUrl(githubBaseUrl: string | null, branch: string | null
 export function deriveGitHubUrl(repoName: string | null | undefined): string | null {
   if (!repoName) return null;
   // Match "owner/repo" pattern (no slashes beyond the single separator)
-  if (/^[a-zA-Z0-9._-]+\/[a-zA-Z0-9._-]+$/.test(repoName)) {
+  if (OWNER_REPO_RE.test(repoName)) {
     return `https://github.com/${repoName}`;
   }
   return null;
@@ -93,8 +101,8 @@ export function deriveGitHubUrl(repoName: string | null | undefined): string | n
  * Falls back to the basename segments if no match. */
 export function stripRepoRoot(filePath: string, repoName: string | null): string {
   if (!repoName || !filePath.startsWith('/')) return filePath;
-  const repoDir = repoName.includes('/') ? repoName.split('/').pop()! : repoName;
-  const marker = `/${repoDir}/`;
+  // Last segment of "owner/repo" (or the whole name) — slice rather than split into an array
+  const marker = `/${repoName.slice(repoName.lastIndexOf('/') + 1)}/`;
   const idx = filePath.indexOf(marker);
   if (idx !== -1) {
     return filePath.slice(idx + marker.length);
@@ -0,0 +1,81 @@
+/**
+ * Shared session formatting for the live timeline endpoints.
+ * Used by /api/v1/activity and /api/v1/stream, which must emit the same shape.
+ */
+
+import type { Session, SessionWithMember } from '@lib/db/types';
+
+// v2 doesn't track devices — every session reports the same placeholder
+const DEFAULT_DEVICE = { id: 'default', name: 'local', is_remote: false } as const;
+
+/** Wire shape of a session on the live timeline (activity + stream). */
+export type TimelineSession = {
+  id: string;
+  user: { id: string; name: string };
+  device: typeof DEFAULT_DEVICE;
+  repo: { id: string; name: string; remote_url: string | null };
+  branch: string | null;
+  worktree: string | null;
+  status: Session['status'];
+  started_at: string;
+  last_activity_at: string;
+  ended_at: string | null;
+  agent_type: string;
+  model: string | null;
+  total_cost_usd: number | null;
+  num_turns: number;
+  duration_ms: number | null;
+  activity: {
+    semantic_scope: null;
+    summary: string | null;
+    files: string[];
+    created_at: string;
+  } | null;
+};
+
+/**
+ * Format v2 session to match v1 UI expectations.
+ * The UI components expect a specific shape, so we adapt the new schema.
+ */
+export function formatTimelineSession(session: SessionWithMember): TimelineSession {
+  return {
+    id: session.id,
+    user: {
+      id: session.member.user_id,
+      name: session.member.display_name,
+    },
+    device: DEFAULT_DEVICE,
+    repo: session.repo
+      ? {
+          id: session.repo.id,
+          name: session.repo.name,
+          remote_url: session.repo.remote_url ?? null,
+        }
+      : {
+          id: 'unknown',
+          name: session.repo_name,
+          remote_url: null,
+        },
+    branch: session.git_branch,
+    worktree: session.cwd || null,
+    status: session.status,
+    started_at: session.started_at,
+    last_activity_at: session.last_activity_at || session.started_at,
+    ended_at: session.ended_at,
+    // v2 specific fields
+    agent_type: session.agent_type,
+    model: session.model,
+    total_cost_usd: session.total_cost_usd,
+    num_turns: session.num_turns,
+    duration_ms: session.duration_ms,
+    // Activity content - use generated_summary from session
+    activity: session.generated_summary || session.result_summary
+      ? {
+          semantic_scope: null, // v2 doesn't have semantic scope
+          summary: session.generated_summary || session.result_summary,
+          files: [], // Files are in file_operations table now
+          created_at: session.started_at,
+        }
+      : null,
+  };
+}
@@ -11,59 +11,8 @@
 
 import type { APIContext } from 'astro';
 import { authenticateAny, errorResponse, successResponse } from '@lib/auth/middleware';
-import { getSessions, markStaleSessions, deleteExpiredWebSessions, getAllMembers } from '@lib/db/queries';
-import type { SessionWithMember } from '@lib/db/types';
-
-/**
- * Format v2 session to match v1 UI expectations.
- * The UI components expect a specific shape, so we adapt the new schema.
- */
-function formatSession(session: SessionWithMember) {
-  return {
-    id: session.id,
-    user: {
-      id: session.member.user_id,
-      name: session.member.display_name,
-    },
-    device: {
-      id: 'default', // v2 doesn't track devices
-      name: 'local',
-      is_remote: false,
-    },
-    repo: session.repo
-      ? {
-          id: session.repo.id,
-          name: session.repo.name,
-          remote_url: session.repo.remote_url ?? null,
-        }
-      : {
-          id: 'unknown',
-          name: session.repo_name,
-          remote_url: null,
-        },
-    branch: session.git_branch,
-    worktree: session.cwd || null,
-    status: session.status,
-    started_at: session.started_at,
-    last_activity_at: session.last_activity_at || session.started_at,
-    ended_at: session.ended_at,
-    // v2 specific fields
-    agent_type: session.agent_type,
-    model: session.model,
-    total_cost_usd: session.total_cost_usd,
-    num_turns: session.num_turns,
-    duration_ms: session.duration_ms,
-    // Activity content - use generated_summary from session
-    activity: session.generated_summary || session.result_summary
-      ? {
-          semantic_scope: null, // v2 doesn't have semantic scope
-          summary: session.generated_summary || session.result_summary,
-          files: [], // Files are in file_operations table now
-          created_at: session.started_at,
-        }
-      : null,
-  };
-}
+import { getSessions, maybeMarkStaleSessions, maybeDeleteExpiredWebSessions, getAllMembers } from '@lib/db/queries';
+import { formatTimelineSession } from '@lib/utils/timeline';
 
 export async function GET(context: APIContext) {
   const { request } = context;
@@ -90,8 +39,10 @@ export async function GET(context: APIContext) {
   const includeStale = includeStaleParam !== 'false';
 
   try {
-    // On-demand cleanup: mark stale sessions and clean up expired tokens
-    await Promise.all([markStaleSessions(db), deleteExpiredWebSessions(db)]);
+    // On-demand cleanup: stale status affects this response, so wait for it;
+    // expired-token cleanup doesn't, so let it finish after the response
+    context.locals.runtime.ctx.waitUntil(maybeDeleteExpiredWebSessions(db).catch(() => { /* non-fatal */ }));
+    await maybeMarkStaleSessions(db);
 
     // Handle byUser view - return list of users with session counts
     if (view === 'byUser' && !userIdParam) {
@@ -135,7 +86,7 @@ export async function GET(context: APIContext) {
     });
 
     return successResponse({
-      sessions: result.sessions.map(formatSession),
+      sessions: result.sessions.map(formatTimelineSession),
       total: result.total,
       limit,
       offset,
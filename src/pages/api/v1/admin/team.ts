@@ -25,7 +25,8 @@ export async function GET(context: APIContext) {
   }
 
   try {
-    const config = await getTeamConfig(db);
+    // Uncached — a save served by another isolate must show up immediately
+    const config = await getTeamConfig(db, { fresh: true });
     if (!config) {
       return errorResponse('Team not configured', 404);
     }
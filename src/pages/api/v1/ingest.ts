@@ -10,13 +10,13 @@
 import type { APIContext } from 'astro';
 import { z } from 'zod';
 import { authenticateTracer, errorResponse, successResponse } from '@lib/auth/middleware';
-import {
-  getTeamConfig,
-} from '@lib/db/queries';
 import type { IngestEvent, Session, Repo } from '@lib/db/types';
-import { maybeGenerateSummary, generateSessionSummary } from '@lib/summary';
+import { maybeGenerateSummaries, generateSessionSummary } from '@lib/summary';
 import { classifyActivity } from '@lib/activity';
 
+// Minimum age of members.last_active_at before ingest rewrites it
+const LAST_ACTIVE_REFRESH_MS = 60 * 1000;
+
 // Zod schema for validation
 const IngestEventSchema = z.object({
   session_id: z.string().min(1),
@@ -71,6 +71,8 @@ const IngestPayloadSchema = z.object({
   events: z.array(IngestEventSchema).min(1).max(500),
 });
 
+type IngestPayload = z.infer<typeof IngestPayloadSchema>;
+
 export async function POST(context: APIContext) {
   const db = context.locals.runtime.env.DB;
 
@@ -80,10 +82,10 @@ export async function POST(context: APIContext) {
     return errorResponse(authResult.error, authResult.status);
   }
 
-  const { member } = authResult.context;
+  const { member, teamConfig } = authResult.context;
 
   // Parse and validate request body
-  let payload: z.infer<typeof IngestPayloadSchema>;
+  let payload: IngestPayload;
   try {
     const body = await context.request.json();
     payload = IngestPayloadSchema.parse(body);
@@ -104,14 +106,14 @@ export async function POST(context: APIContext) {
     agent_responses_created: 0,
   };
 
-  // ── Phase 1: Pre-cache unique sessions, repos, and config in parallel ─
+  // ── Phase 1: Pre-cache unique sessions and repos in parallel ─────────
   const uniqueSessionIds = [...new Set(payload.events.map((e) => e.session_id))];
   const uniqueRepoNames = [...new Set(payload.events.map((e) => e.repo_name))];
 
   const sessionCache = new Map<string, Session>();
   const repoCache = new Map<string, Repo | null>();
 
-  const [sessionResults, repoResults, teamConfig] = await Promise.all([
+  const [sessionResults, repoResults] = await Promise.all([
     uniqueSessionIds.length > 0
       ? db.prepare(`SELECT * FROM sessions WHERE id IN (${uniqueSessionIds.map(() => '?').join(',')})`)
           .bind(...uniqueSessionIds).all<Session>()
@@ -120,7 +122,6 @@ export async function POST(context: APIContext) {
       ? db.prepare(`SELECT * FROM repos WHERE name IN (${uniqueRepoNames.map(() => '?').join(',')})`)
           .bind(...uniqueRepoNames).all<Repo>()
       : { results: [] as Repo[] },
-    getTeamConfig(db),
   ]);
 
   for (const session of sessionResults.results) {
@@ -132,12 +133,48 @@ export async function POST(context: APIContext) {
 
   // ── Phase 2: Process events, collecting batch statements ────────────
   const statements: D1PreparedStatement[] = [];
-  const sessionsForSummary = new Set<string>();
   const endedSessions = new Set<string>();
+  // Keys double as the set of sessions due a rolling-summary check
   const eventCountIncrements = new Map<string, number>();
   const promptsForClassification: Array<{ sessionId: string; userId: string; repoName: string; promptText: string; timestamp: string }> = [];
   const sessionTokenUpdates = new Map<string, { input: number; output: number; cacheCreate: number; cacheRead: number }>();
 
+  // Activity classification needs an LLM — without one, don't queue prompts for it at all
+  const encryptionKey = context.locals.runtime.env.TEAM_ENCRYPTION_KEY;
+  const classifyPrompts = Boolean(
+    encryptionKey && teamConfig.llm_api_key_encrypted &&
+    teamConfig.llm_provider && teamConfig.llm_provider !== 'heuristic'
+  );
+
+  // Reactivation window, computed once for the whole batch
+  const now = Date.now();
+  const staleMs = (teamConfig.stale_timeout_hours ?? 8) * 60 * 60 * 1000;
+
+  /**
+   * Ensure the session for an activity event exists and is active.
+   * Creates it with OR IGNORE (D1 read-replica lag — the session may exist on
+   * the primary but not yet be visible to the read replica), or reactivates a
+   * stale session if the event is recent.
+   */
+  const ensureActiveSession = (event: IngestPayload['events'][number], repoId: string | null) => {
+    const cached = sessionCache.get(event.session_id);
+    if (!cached) {
+      statements.push(
+        db.prepare(
+          `INSERT OR IGNORE INTO sessions (id, user_id, repo_id, repo_name, agent_type, started_at, status)
+           VALUES (?, ?, ?, ?, ?, ?, 'active')`
+        ).bind(event.session_id, event.user_id, repoId, event.repo_name, event.agent_type, event.timestamp)
+      );
+      sessionCache.set(event.session_id, { id: event.session_id, status: 'active' } as Session);
+      results.sessions_created++;
+    } else if (cached.status === 'stale' && now - Date.parse(event.timestamp) < staleMs) {
+      statements.push(
+        db.prepare(`UPDATE sessions SET status = 'active', ended_at = NULL WHERE id = ?`).bind(event.session_id)
+      );
+      cached.status = 'active' as Session['status'];
+    }
+  };
+
   for (const event of payload.events) {
     try {
       if (event.user_id !== member.user_id) {
@@ -153,37 +190,40 @@ export async function POST(context: APIContext) {
           if (existing) {
             // Only reactivate if this is a genuinely recent session_start, not a backfill
             if (existing.status === 'stale' || existing.status === 'ended') {
-              const eventAge = Date.now() - new Date(event.timestamp).getTime();
-              const staleMs = (teamConfig?.stale_timeout_hours ?? 8) * 60 * 60 * 1000;
+              const eventAge = now - Date.parse(event.timestamp);
               if (eventAge < staleMs) {
                 statements.push(
                   db.prepare(`UPDATE sessions SET status = 'active', ended_at = NULL WHERE id = ?`).bind(event.session_id)
                 );
               }
             }
-            // Backfill null git_branch/model
-            const updates: string[] = [];
-            const values: unknown[] = [];
-            if (!existing.git_branch && event.git_branch) {
-              updates.push('git_branch = ?');
-              values.push(event.git_branch);
-            }
-            if (!existing.model && event.model) {
-              updates.push('model = ?');
-              values.push(event.model);
-            }
-            if (updates.length > 0) {
-              values.push(event.session_id);
+            // Backfill missing (null or empty) git_branch/model — one fixed statement,
+            // COALESCE(NULLIF(...)) keeps existing non-empty values
+            const backfillBranch = existing.git_branch ? null : event.git_branch || null;
+            const backfillModel = existing.model ? null : event.model || null;
+            if (backfillBranch || backfillModel) {
               statements.push(
-                db.prepare(`UPDATE sessions SET ${updates.join(', ')} WHERE id = ?`).bind(...values)
+                db.prepare(
+                  `UPDATE sessions SET git_branch = COALESCE(NULLIF(git_branch, ''), ?, git_branch), model = COALESCE(NULLIF(model, ''), ?, model) WHERE id = ?`
+                ).bind(backfillBranch, backfillModel, event.session_id)
               );
             }
           } else {
-            // Create new session
+            // Create new session. A concurrent batch or read-replica lag can mean an activity
+            // event already created a stub row — a constraint failure would roll back this whole
+            // batch, so upsert instead and fill the stub's missing metadata from this event
             statements.push(
               db.prepare(
                 `INSERT INTO sessions (id, user_id, repo_id, repo_name, agent_type, agent_version, cwd, git_branch, model, hostname, device_name, is_remote, started_at, status)
-                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'active')`
+                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'active')
+                 ON CONFLICT(id) DO UPDATE SET
+                   agent_version = COALESCE(NULLIF(sessions.agent_version, ''), excluded.agent_version),
+                   cwd = COALESCE(NULLIF(sessions.cwd, ''), excluded.cwd),
+                   git_branch = COALESCE(NULLIF(sessions.git_branch, ''), excluded.git_branch),
+                   model = COALESCE(NULLIF(sessions.model, ''), excluded.model),
+                   hostname = COALESCE(NULLIF(sessions.hostname, ''), excluded.hostname),
+                   device_name = COALESCE(NULLIF(sessions.device_name, ''), excluded.device_name),
+                   is_remote = MAX(COALESCE(sessions.is_remote, 0), excluded.is_remote)`
               ).bind(
                 event.session_id,
                 event.user_id,
@@ -205,22 +245,25 @@ export async function POST(context: APIContext) {
             results.sessions_created++;
           }
 
-          // Store git remote URL on repo (first-write-wins)
-          if (event.git_remote_url && repoId) {
+          // Store git remote URL on repo (first-write-wins) — skip the write when the
+          // pre-cached repo row already has one
+          const repo = repoCache.get(event.repo_name);
+          if (event.git_remote_url && repo && !repo.remote_url) {
             statements.push(
               db.prepare(`UPDATE repos SET remote_url = ? WHERE id = ? AND remote_url IS NULL`)
-                .bind(event.git_remote_url, repoId)
+                .bind(event.git_remote_url, repo.id)
             );
+            repo.remote_url = event.git_remote_url;
           }
           break;
         }
 
         case 'session_end': {
-          // Ensure session exists
+          // Ensure session exists (OR IGNORE, same as session_start)
           if (!sessionCache.has(event.session_id)) {
             statements.push(
               db.prepare(
-                `INSERT INTO sessions (id, user_id, repo_id, repo_name, agent_type, started_at, status)
+                `INSERT OR IGNORE INTO sessions (id, user_id, repo_id, repo_name, agent_type, started_at, status)
                  VALUES (?, ?, ?, ?, ?, ?, 'active')`
               ).bind(event.session_id, event.user_id, repoId, event.repo_name, event.agent_type, event.timestamp)
             );
@@ -260,31 +303,7 @@ export async function POST(context: APIContext) {
         }
 
         case 'file_op': {
-          // Ensure session exists (OR IGNORE to handle D1 read-replica lag —
-          // session may exist on primary but not yet visible to read replica)
-          if (!sessionCache.has(event.session_id)) {
-            statements.push(
-              db.prepare(
-                `INSERT OR IGNORE INTO sessions (id, user_id, repo_id, repo_name, agent_type, started_at, status)
-                 VALUES (?, ?, ?, ?, ?, ?, 'active')`
-              ).bind(event.session_id, event.user_id, repoId, event.repo_name, event.agent_type, event.timestamp)
-            );
-            sessionCache.set(event.session_id, { id: event.session_id, status: 'active' } as Session);
-            results.sessions_created++;
-          } else {
-            // Reactivate stale session if event is recent
-            const cached = sessionCache.get(event.session_id)!;
-            if (cached.status === 'stale') {
-              const eventAge = Date.now() - new Date(event.timestamp).getTime();
-              const staleMs = (teamConfig?.stale_timeout_hours ?? 8) * 60 * 60 * 1000;
-              if (eventAge < staleMs) {
-                statements.push(
-                  db.prepare(`UPDATE sessions SET status = 'active', ended_at = NULL WHERE id = ?`).bind(event.session_id)
-                );
-                cached.status = 'active' as Session['status'];
-              }
-            }
-          }
+          ensureActiveSession(event, repoId);
 
           statements.push(
             db.prepare(
@@ -310,35 +329,11 @@ export async function POST(context: APIContext) {
           );
           results.file_ops_created++;
           eventCountIncrements.set(event.session_id, (eventCountIncrements.get(event.session_id) ?? 0) + 1);
-          sessionsForSummary.add(event.session_id);
           break;
         }
 
         case 'prompt': {
-          // Ensure session exists (OR IGNORE to handle D1 read-replica lag)
-          if (!sessionCache.has(event.session_id)) {
-            statements.push(
-              db.prepare(
-                `INSERT OR IGNORE INTO sessions (id, user_id, repo_id, repo_name, agent_type, started_at, status)
-                 VALUES (?, ?, ?, ?, ?, ?, 'active')`
-              ).bind(event.session_id, event.user_id, repoId, event.repo_name, event.agent_type, event.timestamp)
-            );
-            sessionCache.set(event.session_id, { id: event.session_id, status: 'active' } as Session);
-            results.sessions_created++;
-          } else {
-            // Reactivate stale session if event is recent
-            const cached = sessionCache.get(event.session_id)!;
-            if (cached.status === 'stale') {
-              const eventAge = Date.now() - new Date(event.timestamp).getTime();
-              const staleMs = (teamConfig?.stale_timeout_hours ?? 8) * 60 * 60 * 1000;
-              if (eventAge < staleMs) {
-                statements.push(
-                  db.prepare(`UPDATE sessions SET status = 'active', ended_at = NULL WHERE id = ?`).bind(event.session_id)
-                );
-                cached.status = 'active' as Session['status'];
-              }
-            }
-          }
+          ensureActiveSession(event, repoId);
 
           statements.push(
             db.prepare(
@@ -357,10 +352,9 @@ export async function POST(context: APIContext) {
           );
           results.prompts_created++;
           eventCountIncrements.set(event.session_id, (eventCountIncrements.get(event.session_id) ?? 0) + 1);
-          sessionsForSummary.add(event.session_id);
 
           // Collect for activity classification
-          if (event.prompt_text) {
+          if (classifyPrompts && event.prompt_text) {
             promptsForClassification.push({
               sessionId: event.session_id,
               userId: event.user_id,
@@ -373,30 +367,7 @@ export async function POST(context: APIContext) {
         }
 
         case 'agent_response': {
-          // Ensure session exists (OR IGNORE to handle D1 read-replica lag)
-          if (!sessionCache.has(event.session_id)) {
-            statements.push(
-              db.prepare(
-                `INSERT OR IGNORE INTO sessions (id, user_id, repo_id, repo_name, agent_type, started_at, status)
-                 VALUES (?, ?, ?, ?, ?, ?, 'active')`
-              ).bind(event.session_id, event.user_id, repoId, event.repo_name, event.agent_type, event.timestamp)
-            );
-            sessionCache.set(event.session_id, { id: event.session_id, status: 'active' } as Session);
-            results.sessions_created++;
-          } else {
-            // Reactivate stale session if event is recent
-            const cached = sessionCache.get(event.session_id)!;
-            if (cached.status === 'stale') {
-              const eventAge = Date.now() - new Date(event.timestamp).getTime();
-              const staleMs = (teamConfig?.stale_timeout_hours ?? 8) * 60 * 60 * 1000;
-              if (eventAge < staleMs) {
-                statements.push(
-                  db.prepare(`UPDATE sessions SET status = 'active', ended_at = NULL WHERE id = ?`).bind(event.session_id)
-                );
-                cached.status = 'active' as Session['status'];
-              }
-            }
-          }
+          ensureActiveSession(event, repoId);
 
           statements.push(
             db.prepare(
@@ -416,7 +387,6 @@ export async function POST(context: APIContext) {
           );
           results.agent_responses_created++;
           eventCountIncrements.set(event.session_id, (eventCountIncrements.get(event.session_id) ?? 0) + 1);
-          sessionsForSummary.add(event.session_id);
           break;
         }
 
@@ -460,9 +430,15 @@ export async function POST(context: APIContext) {
       ).bind(count, tokens?.input ?? 0, tokens?.output ?? 0, tokens?.cacheCreate ?? 0, tokens?.cacheRead ?? 0, sessionId)
     );
   }
-  statements.push(
-    db.prepare(`UPDATE members SET last_active_at = datetime('now') WHERE user_id = ?`).bind(member.user_id)
-  );
+  // last_active_at only drives "last seen" displays — skip the write when it's already fresh
+  const lastActiveMs = member.last_active_at
+    ? Date.parse(member.last_active_at.replace(' ', 'T') + 'Z')
+    : NaN;
+  if (!(Date.now() - lastActiveMs < LAST_ACTIVE_REFRESH_MS)) {
+    statements.push(
+      db.prepare(`UPDATE members SET last_active_at = datetime('now') WHERE user_id = ?`).bind(member.user_id)
+    );
+  }
 
   // ── Phase 4: Execute all statements in one batch round-trip ─────────
   if (statements.length > 0) {
@@ -470,10 +446,13 @@ export async function POST(context: APIContext) {
   }
 
   // ── Phase 5: Background post-processing (waitUntil) ─────────────────
-  const encryptionKey = context.locals.runtime.env.TEAM_ENCRYPTION_KEY;
-
-  for (const sessionId of sessionsForSummary) {
-    context.locals.runtime.ctx.waitUntil(maybeGenerateSummary(db, sessionId, encryptionKey, teamConfig));
+  // Sessions that ended in this batch get a final summary below — skip their rolling one
+  const rollingSummaryIds = [...eventCountIncrements.keys()].filter((id) => !endedSessions.has(id));
+  if (rollingSummaryIds.length > 0) {
+    context.locals.runtime.ctx.waitUntil(
+      maybeGenerateSummaries(db, rollingSummaryIds, encryptionKey, teamConfig)
+        .catch((error) => console.error('Summary check failed:', error))
+    );
   }
   for (const sessionId of endedSessions) {
     context.locals.runtime.ctx.waitUntil(generateSessionSummary(db, sessionId, encryptionKey, teamConfig));
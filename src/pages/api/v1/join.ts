@@ -36,8 +36,8 @@ export async function POST(context: APIContext) {
   const input = parseResult.data;
 
   try {
-    // Get team config
-    const teamConfig = await getTeamConfig(db);
+    // Get team config — uncached, so a rotated join code stops working everywhere at once
+    const teamConfig = await getTeamConfig(db, { fresh: true });
     if (!teamConfig) {
       return errorResponse('Team not configured. Please run /setup first.', 404);
     }
@@ -12,7 +12,7 @@
 import type { APIContext } from 'astro';
 import { z } from 'zod';
 import { authenticateTracer, errorResponse, successResponse } from '@lib/auth/middleware';
-import { queryOverlapsForFile, getLatestEditsForSessions, createOverlap, getTeamConfig } from '@lib/db/queries';
+import { queryOverlapsForFile, getLatestEditsForSessions, createOverlap } from '@lib/db/queries';
 
 const OverlapQuerySchema = z.object({
   repo_name: z.string().min(1),
@@ -26,6 +26,11 @@ const OverlapQuerySchema = z.object({
 type OverlapTier = 'line' | 'function' | 'adjacent' | 'file';
 type OverlapDecision = 'proceed' | 'warn' | 'block';
 
+// Sort rank per tier: line > function > adjacent > file
+const TIER_ORDER: Record<OverlapTier, number> = { line: 0, function: 1, adjacent: 2, file: 3 };
+// Tiers that are logged to the overlaps table and can block
+const HARD_TIERS: ReadonlySet<OverlapTier> = new Set<OverlapTier>(['line', 'function']);
+
 type OverlapResult = {
   display_name: string;
   session_id: string;
@@ -83,8 +88,11 @@ function computeTier(
 
 /** Truncate a string to maxLen characters, appending "..." if truncated. */
 function truncate(s: string | null, maxLen: number): string | null {
-  if (!s) return s;
-  return s.length > maxLen ? s.slice(0, maxLen) + '...' : s;
+  if (!s || s.length <= maxLen) return s;
+  // Don't split a surrogate pair — a lone high surrogate renders as garbage in the hook output
+  const code = s.charCodeAt(maxLen - 1);
+  const end = code >= 0xd800 && code <= 0xdbff ? maxLen - 1 : maxLen;
+  return s.slice(0, end) + '...';
 }
 
 /** Build a human-readable region description like "queryFn() (lines 700-780)" */
@@ -106,7 +114,7 @@ export async function POST(context: APIContext) {
     return errorResponse(authResult.error, authResult.status);
   }
 
-  const { member } = authResult.context;
+  const { member, teamConfig } = authResult.context;
 
   // Parse and validate request body
   let query: z.infer<typeof OverlapQuerySchema>;
@@ -121,8 +129,7 @@ export async function POST(context: APIContext) {
   }
 
   // Use team's stale timeout as recency window for overlap detection
-  const config = await getTeamConfig(db);
-  const staleHours = config?.stale_timeout_hours ?? 8;
+  const staleHours = teamConfig.stale_timeout_hours ?? 8;
 
   // Query file operations from other users' active sessions
   const rows = await queryOverlapsForFile(
@@ -158,22 +165,19 @@ export async function POST(context: APIContext) {
   }));
 
   // Sort: line > function > adjacent > file
-  const tierOrder: Record<OverlapTier, number> = { line: 0, function: 1, adjacent: 2, file: 3 };
-  tieredRows.sort((a, b) => tierOrder[a.tier] - tierOrder[b.tier]);
+  tieredRows.sort((a, b) => TIER_ORDER[a.tier] - TIER_ORDER[b.tier]);
 
-  // Dedupe session+file pairs for the enrichment query
-  const seen = new Set<string>();
-  const sessionFilePairs: Array<{ sessionId: string; filePath: string }> = [];
+  // Dedupe session+file pairs for the enrichment query (Map keeps first-seen order)
+  const sessionFilePairs = new Map<string, { sessionId: string; filePath: string }>();
   for (const row of tieredRows) {
     const key = `${row.session_id}:${row.file_path}`;
-    if (!seen.has(key)) {
-      seen.add(key);
-      sessionFilePairs.push({ sessionId: row.session_id, filePath: row.file_path });
+    if (!sessionFilePairs.has(key)) {
+      sessionFilePairs.set(key, { sessionId: row.session_id, filePath: row.file_path });
     }
   }
 
   // Fetch latest edits + push state for each overlapping session
-  const latestEdits = await getLatestEditsForSessions(db, sessionFilePairs);
+  const latestEdits = await getLatestEditsForSessions(db, [...sessionFilePairs.values()]);
   const editMap = new Map(latestEdits.map((e) => [`${e.session_id}:${e.file_path}`, e]));
 
   // Build enriched overlap results
@@ -203,19 +207,18 @@ export async function POST(context: APIContext) {
     };
   });
 
+  // Hard overlaps (line/function) drive the decision, guidance and logging — filter once
+  const hardOverlaps = overlaps.filter((o) => HARD_TIERS.has(o.tier));
+
   // Only unpushed hard overlaps warrant a block — pushed changes just need a pull
-  const hasUnpushedHardOverlap = overlaps.some(
-    (o) => (o.tier === 'line' || o.tier === 'function') && !o.is_pushed
-  );
+  const hasUnpushedHardOverlap = hardOverlaps.some((o) => !o.is_pushed);
   const decision = hasUnpushedHardOverlap ? 'block' as const : 'warn' as const;
 
   // Generate guidance note
-  const hasAnyHardOverlap = overlaps.some((o) => o.tier === 'line' || o.tier === 'function');
-  const guidance = buildGuidance(overlaps, hasAnyHardOverlap);
+  const guidance = buildGuidance(overlaps, hardOverlaps);
 
   // Side-effect: log hard overlaps to the overlaps table (deduped, via waitUntil)
-  if (hasAnyHardOverlap) {
-    const hardOverlaps = overlaps.filter((o) => o.tier === 'line' || o.tier === 'function');
+  if (hardOverlaps.length > 0) {
     context.locals.runtime.ctx.waitUntil(
       logHardOverlaps(db, hardOverlaps, member.user_id, member.display_name, query.session_id, sessionUserMap, guidance, decision)
     );
@@ -239,12 +242,11 @@ function formatRelativeTimeSimple(isoDate: string): string {
 /**
  * Build a guidance note based on overlap data.
  */
-function buildGuidance(overlaps: OverlapResult[], hasHardOverlap: boolean): string {
+function buildGuidance(overlaps: OverlapResult[], hardOverlaps: OverlapResult[]): string {
   const lines: string[] = [];
 
-  if (hasHardOverlap) {
-    const hard = overlaps.filter((o) => o.tier === 'line' || o.tier === 'function');
-    for (const o of hard) {
+  if (hardOverlaps.length > 0) {
+    for (const o of hardOverlaps) {
       const region = regionDesc(o);
       const branch = o.git_branch ? ` (branch '${o.git_branch}')` : '';
 
@@ -300,11 +302,18 @@ async function logHardOverlaps(
   guidance: string,
   decision: 'block' | 'warn',
 ): Promise<void> {
+  // Several rows often share the same pair + file + scope (one per edited range);
+  // only the first of each needs the dedup lookup — the rest would find its row
+  const logged = new Set<string>();
   for (const o of hardOverlaps) {
     try {
       const otherUserId = sessionUserMap.get(o.session_id) ?? '';
       if (!otherUserId) continue;
 
+      const key = `${otherUserId}:${o.repo_name}:${o.file_path}:${o.tier}`;
+      if (logged.has(key)) continue;
+      logged.add(key);
+
       // Dedup: skip if same pair + file + scope logged in last 24 hours
       const existing = await db.prepare(
         `SELECT id FROM overlaps
@@ -1,56 +1,17 @@
 import type { APIContext } from 'astro';
 import type { SessionWithMember } from '@lib/db/types';
 import { authenticateAny, errorResponse } from '@lib/auth/middleware';
-import { getSessions, markStaleSessions } from '@lib/db/queries';
+import { getSessions, maybeMarkStaleSessions } from '@lib/db/queries';
+import { formatTimelineSession } from '@lib/utils/timeline';
 
 const POLL_INTERVAL_MS = 1000; // Check for changes every 1 second
 const KEEPALIVE_INTERVAL_MS = 15000; // Send keepalive every 15 seconds
-const STALE_CHECK_INTERVAL_MS = 30000; // Check for stale sessions every 30 seconds
-
-function formatSession(session: SessionWithMember) {
-  return {
-    id: session.id,
-    user: {
-      id: session.member.user_id,
-      name: session.member.display_name,
-    },
-    device: {
-      id: 'default',
-      name: 'local',
-      is_remote: false,
-    },
-    repo: session.repo
-      ? {
-          id: session.repo.id,
-          name: session.repo.name,
-          remote_url: session.repo.remote_url ?? null,
-        }
-      : {
-          id: 'unknown',
-          name: session.repo_name,
-          remote_url: null,
-        },
-    branch: session.git_branch,
-    worktree: session.cwd || null,
-    status: session.status,
-    started_at: session.started_at,
-    last_activity_at: session.last_activity_at || session.started_at,
-    ended_at: session.ended_at,
-    agent_type: session.agent_type,
-    model: session.model,
-    total_cost_usd: session.total_cost_usd,
-    num_turns: session.num_turns,
-    duration_ms: session.duration_ms,
-    activity: session.generated_summary || session.result_summary
-      ? {
-          semantic_scope: null,
-          summary: session.generated_summary || session.result_summary,
-          files: [],
-          created_at: session.started_at,
-        }
-      : null,
-  };
-}
+
+// Fixed frames are identical for every connection — encode them once
+const encoder = new TextEncoder();
+const CONNECTED_FRAME = encoder.encode(`event: connected\ndata: ${JSON.stringify({ status: 'connected' })}\n\n`);
+const KEEPALIVE_FRAME = encoder.encode(': keepalive\n\n');
+const ERROR_FRAME = encoder.encode(`event: error\ndata: ${JSON.stringify({ message: 'Stream error' })}\n\n`);
 
 /**
  * Build a fingerprint string for a session that changes whenever something
@@ -76,8 +37,6 @@ export async function GET(context: APIContext) {
     return errorResponse(authResult.error, authResult.status);
   }
 
-  const encoder = new TextEncoder();
-
   const stream = new ReadableStream({
     async start(controller) {
       let isActive = true;
@@ -89,27 +48,20 @@ export async function GET(context: APIContext) {
       });
 
       // Send initial connected event
-      controller.enqueue(
-        encoder.encode(`event: connected\ndata: ${JSON.stringify({ status: 'connected' })}\n\n`)
-      );
+      controller.enqueue(CONNECTED_FRAME);
 
       // Snapshot-diff approach: track fingerprint of each session
       // so we detect ANY change (new activity, status change, new session, removed session)
       let knownSessions = new Map<string, string>(); // sessionId -> fingerprint
       let lastKeepalive = Date.now();
-      let lastStaleCheck = Date.now();
       let eventCounter = 0;
       let lastChangeSignature = ''; // lightweight change detection
 
       // Polling loop
       while (isActive) {
         try {
-          // Periodically mark stale sessions (not every poll — it's a write operation)
-          const now = Date.now();
-          if (now - lastStaleCheck > STALE_CHECK_INTERVAL_MS) {
-            await markStaleSessions(db);
-            lastStaleCheck = now;
-          }
+          // Periodically mark stale sessions (throttled per isolate — it's a write operation)
+          await maybeMarkStaleSessions(db);
 
           // Lightweight change check: single-row query to detect if anything changed
           const changeCheck = await db
@@ -127,7 +79,7 @@ export async function GET(context: APIContext) {
             // No change — just send keepalive if needed
             const nowAfterCheck = Date.now();
             if (nowAfterCheck - lastKeepalive > KEEPALIVE_INTERVAL_MS) {
-              controller.enqueue(encoder.encode(': keepalive\n\n'));
+              controller.enqueue(KEEPALIVE_FRAME);
               lastKeepalive = nowAfterCheck;
             }
             await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
@@ -144,32 +96,29 @@ export async function GET(context: APIContext) {
             currentSessions.set(session.id, session);
           }
 
-          // Detect changes: new sessions, updated sessions
+          // Detect changes: new sessions, updated sessions. Collect the frames and
+          // write them as one chunk; the fingerprints become the new known state.
+          const nextKnown = new Map<string, string>();
+          let frames = '';
           for (const [id, session] of currentSessions) {
             const fp = sessionFingerprint(session);
-            const prevFp = knownSessions.get(id);
+            nextKnown.set(id, fp);
 
-            if (prevFp !== fp) {
+            if (knownSessions.get(id) !== fp) {
               // New or changed session — send event
               eventCounter++;
-              controller.enqueue(
-                encoder.encode(
-                  `id: ${eventCounter}\nevent: activity\ndata: ${JSON.stringify(formatSession(session))}\n\n`
-                )
-              );
+              frames += `id: ${eventCounter}\nevent: activity\ndata: ${JSON.stringify(formatTimelineSession(session))}\n\n`;
             }
           }
-
-          // Update known state
-          knownSessions = new Map();
-          for (const [id, session] of currentSessions) {
-            knownSessions.set(id, sessionFingerprint(session));
+          if (frames) {
+            controller.enqueue(encoder.encode(frames));
           }
+          knownSessions = nextKnown;
 
           // Send keepalive if needed
           const nowAfterPoll = Date.now();
           if (nowAfterPoll - lastKeepalive > KEEPALIVE_INTERVAL_MS) {
-            controller.enqueue(encoder.encode(': keepalive\n\n'));
+            controller.enqueue(KEEPALIVE_FRAME);
             lastKeepalive = nowAfterPoll;
           }
 
@@ -181,9 +130,7 @@ export async function GET(context: APIContext) {
 
           // Send error event
           try {
-            controller.enqueue(
-              encoder.encode(`event: error\ndata: ${JSON.stringify({ message: 'Stream error' })}\n\n`)
-            );
+            controller.enqueue(ERROR_FRAME);
           } catch { /* stream may be closed */ }
 
           // Wait before retrying
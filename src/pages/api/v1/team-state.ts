@@ -44,30 +44,29 @@ export async function GET(context: APIContext) {
     // Group rows by session_id, nesting file regions
     const sessionsMap = new Map<string, TeamStateSession>();
 
-    for (const row of rows) {
-      const r = row as Record<string, unknown>;
-      const sessionId = r.session_id as string;
-
-      if (!sessionsMap.has(sessionId)) {
-        sessionsMap.set(sessionId, {
-          session_id: sessionId,
-          user_id: r.user_id as string,
-          display_name: r.display_name as string,
-          repo_name: r.repo_name as string,
-          started_at: r.started_at as string,
-          summary: (r.summary as string) || null,
+    for (const r of rows) {
+      let session = sessionsMap.get(r.session_id);
+      if (!session) {
+        session = {
+          session_id: r.session_id,
+          user_id: r.user_id,
+          display_name: r.display_name,
+          repo_name: r.repo_name,
+          started_at: r.started_at,
+          summary: r.summary || null,
           regions: [],
-        });
+        };
+        sessionsMap.set(r.session_id, session);
       }
 
       // Add file region if present
       if (r.file_path) {
-        sessionsMap.get(sessionId)!.regions.push({
-          file_path: r.file_path as string,
-          start_line: (r.start_line as number) || null,
-          end_line: (r.end_line as number) || null,
-          function_name: (r.function_name as string) || null,
-          last_touched_at: (r.last_touched_at as string) || null,
+        session.regions.push({
+          file_path: r.file_path,
+          start_line: r.start_line || null,
+          end_line: r.end_line || null,
+          function_name: r.function_name || null,
+          last_touched_at: r.last_touched_at || null,
         });
       }
     }